@@ -0,0 +1,20 @@
+# background.py — Long-running background loops
+#
+# Periodic loops (scene snapshots, rule reloads, maintenance, the watchdog
+# heartbeat) are started from on_ready, which runs again after every
+# reconnect. Each loop is tracked by name so only one copy ever runs.
+import asyncio
+
+_tasks = {}  # name → asyncio.Task
+
+
+def start_loop(name: str, loop) -> bool:
+    """
+    Run the coroutine function `loop` as a task called `name`, unless one by
+    that name is still running. Returns True if a new task was started.
+    """
+    task = _tasks.get(name)
+    if task is not None and not task.done():
+        return False
+    _tasks[name] = asyncio.get_running_loop().create_task(loop(), name=name)
+    return True
@@ -2,11 +2,13 @@
 import discord
 from discord.ui import View, Button
 import json
-from database import (
+from scene import (
     get_character, update_character_field,
     save_last_roll, get_last_roll
 )
 from dice import roll_dice, push_roll, panic_roll, format_dice_roll
+from rules import rules_for
+from outbound import scheduler
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -19,35 +21,14 @@ def attribute_dots(value: int, maximum: int = 5) -> str:
     """Visual attribute display using dots."""
     return "●" * value + "○" * (maximum - value)
 
-def stress_label(stress: int) -> str:
-    """Return a stress level description."""
-    if stress == 0:
-        return "Calm"
-    elif stress <= 2:
-        return "Uneasy"
-    elif stress <= 4:
-        return "Stressed"
-    elif stress <= 6:
-        return "Rattled"
-    elif stress <= 8:
-        return "Panicking"
-    else:
-        return "Breaking Point"
-
-def health_label(health: int, max_health: int) -> str:
-    """Return a health status description."""
-    if health == max_health:
-        return "Healthy"
-    elif health >= max_health * 0.75:
-        return "Scratched"
-    elif health >= max_health * 0.5:
-        return "Hurt"
-    elif health >= max_health * 0.25:
-        return "Wounded"
-    elif health > 0:
-        return "Critical"
-    else:
-        return "💀 Broken"
+def format_table_roll(pr: dict) -> str:
+    """Format a panic / stress response roll to append to a dice roll."""
+    resolve = f" - Resolve({pr['resolve']})" if pr["resolve"] else ""
+    return (
+        f"\n\n**{pr['title'].upper()} ROLL:** 1D6({pr['d6_roll']}) + "
+        f"Stress({pr['stress']}){resolve} = **{pr['total']}**\n"
+        f"*{pr['effect']}*"
+    )
 
 # ── Skill definitions ─────────────────────────────────────────────────────────
 
@@ -71,6 +52,7 @@ SKILLS = {
 
 def build_character_embed(char: dict) -> discord.Embed:
     """Build the full character sheet as a Discord embed."""
+    rules = rules_for(char["discord_guild_id"])
 
     # Colour based on stress level
     if char["stress"] >= 8:
@@ -122,15 +104,29 @@ def build_character_embed(char: dict) -> discord.Embed:
 
     condition = (
         f"**Health**  {h_bar}  `{char['health']}/{char['max_health']}`\n"
-        f"*{health_label(char['health'], char['max_health'])}*\n\n"
+        f"*{rules.health_label(char['health'], char['max_health'])}*\n\n"
         f"**Stress**  {s_bar}  `{char['stress']}/10`\n"
-        f"*{stress_label(char['stress'])}*"
+        f"*{rules.stress_label(char['stress'])}*"
     )
+    if rules.uses_resolve:
+        condition += f"\n\n**Resolve**  `{char['resolve']}`"
     embed.add_field(name="CONDITION", value=condition, inline=False)
 
     embed.set_footer(text="In Search of Typhon  •  Use the buttons below to roll")
     return embed
 
+async def refresh_sheet(discord_user_id: str):
+    """
+    Queue an update of the character's last posted sheet, if there is one.
+    Goes through the outbound scheduler, so a burst of changes becomes one edit.
+    """
+    char = await get_character(discord_user_id)
+    if char and char["sheet_message_id"]:
+        scheduler.edit(
+            char["sheet_channel_id"], char["sheet_message_id"],
+            embed=build_character_embed(char)
+        )
+
 # ── Button Views ──────────────────────────────────────────────────────────────
 
 class AttributeRollButton(Button):
@@ -159,25 +155,25 @@ class AttributeRollButton(Button):
             )
             return
 
+        rules = rules_for(char["discord_guild_id"])
         dice_pool = char[self.attribute]
         result = roll_dice(base_dice=dice_pool, stress_dice=char["stress"])
-        formatted = format_dice_roll(result, self.label)
+        formatted = format_dice_roll(result, self.label, rules.stress_bane.title)
 
         await save_last_roll(self.user_id, result, self.label)
 
-        # If panic triggered, increase stress and do panic roll
+        # If stress dice show a 1, increase stress and roll on the table
         if result["panic_triggered"]:
             new_stress = min(char["stress"] + 1, 10)
             await update_character_field(self.user_id, "stress", new_stress)
-            pr = panic_roll(new_stress)
-            formatted += (
-                f"\n\n**PANIC ROLL:** 1D6({pr['d6_roll']}) + "
-                f"Stress({pr['stress']}) = **{pr['total']}**\n"
-                f"*{pr['effect']}*"
-            )
+            pr = panic_roll(new_stress, rules.stress_bane, char["resolve"])
+            formatted += format_table_roll(pr)
 
         await interaction.response.send_message(formatted)
 
+        if result["panic_triggered"]:
+            await refresh_sheet(self.user_id)
+
 
 class SkillRollButton(Button):
     """A button that rolls attribute + skill dice."""
@@ -208,24 +204,24 @@ class SkillRollButton(Button):
             )
             return
 
+        rules = rules_for(char["discord_guild_id"])
         dice_pool = char[self.attribute] + char[self.skill_key]
         result = roll_dice(base_dice=dice_pool, stress_dice=char["stress"])
-        formatted = format_dice_roll(result, self.label_text)
+        formatted = format_dice_roll(result, self.label_text, rules.stress_bane.title)
 
         await save_last_roll(self.user_id, result, self.label_text)
 
         if result["panic_triggered"]:
             new_stress = min(char["stress"] + 1, 10)
             await update_character_field(self.user_id, "stress", new_stress)
-            pr = panic_roll(new_stress)
-            formatted += (
-                f"\n\n**PANIC ROLL:** 1D6({pr['d6_roll']}) + "
-                f"Stress({pr['stress']}) = **{pr['total']}**\n"
-                f"*{pr['effect']}*"
-            )
+            pr = panic_roll(new_stress, rules.stress_bane, char["resolve"])
+            formatted += format_table_roll(pr)
 
         await interaction.response.send_message(formatted)
 
+        if result["panic_triggered"]:
+            await refresh_sheet(self.user_id)
+
 
 class PushButton(Button):
     """Push the last roll — reroll non-1s and non-6s, gain 1 Stress."""
@@ -259,26 +255,24 @@ class PushButton(Button):
             return
 
         char = await get_character(self.user_id)
+        rules = rules_for(char["discord_guild_id"])
 
         # Increase stress by 1
         new_stress = min(char["stress"] + 1, 10)
         await update_character_field(self.user_id, "stress", new_stress)
 
         pushed = push_roll(last_roll)
-        formatted = format_dice_roll(pushed, skill_name)
+        formatted = format_dice_roll(pushed, skill_name, rules.stress_bane.title)
         formatted += f"\n*Stress increased to {new_stress}*"
 
         await save_last_roll(self.user_id, pushed, skill_name)
 
         if pushed["panic_triggered"]:
-            pr = panic_roll(new_stress)
-            formatted += (
-                f"\n\n**PANIC ROLL:** 1D6({pr['d6_roll']}) + "
-                f"Stress({pr['stress']}) = **{pr['total']}**\n"
-                f"*{pr['effect']}*"
-            )
+            pr = panic_roll(new_stress, rules.stress_bane, char["resolve"])
+            formatted += format_table_roll(pr)
 
         await interaction.response.send_message(formatted)
+        await refresh_sheet(self.user_id)
 
 
 class CharacterSheetView(View):
@@ -319,3 +313,11 @@ class CharacterSheetView(View):
         push_btn = PushButton(user_id)
         push_btn.row = 4
         self.add_item(push_btn)
+
+
+class PushView(View):
+    """Just the push button, for rolls made with /roll rather than the sheet."""
+
+    def __init__(self, user_id: str):
+        super().__init__(timeout=None)
+        self.add_item(PushButton(user_id))
@@ -0,0 +1,11 @@
+# cogs — Slash commands, grouped into discord.py extensions
+#
+# Each module here is loaded with bot.load_extension() and can be swapped in
+# place with /reload, without restarting the bot.
+
+EXTENSIONS = (
+    "cogs.characters",
+    "cogs.scenes",
+    "cogs.gm",
+    "cogs.admin",
+)
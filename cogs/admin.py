@@ -0,0 +1,54 @@
+# cogs/admin.py — Owner-only hot reload of rules code and commands
+import importlib
+import sys
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from cogs import EXTENSIONS
+from commandsync import sync_if_changed
+
+# Stateless modules that can be reloaded under a running bot, in dependency
+# order. Modules that hold state (scene, rules, outbound, expression's parse
+# cache, database) are deliberately left alone so nothing in memory is lost.
+RELOADABLE_MODULES = ("dice", "character")
+
+
+class Admin(commands.Cog):
+    """Bot owner tools."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="reload", description="Reload dice, sheet and command code (bot owner only)")
+    @app_commands.default_permissions(administrator=True)
+    async def reload_cmd(self, interaction: discord.Interaction):
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message(
+                "Only the bot owner can reload the bot.", ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        try:
+            for name in RELOADABLE_MODULES:
+                importlib.reload(sys.modules[name])
+            # Extensions last, so they pick up the freshly loaded modules
+            for extension in EXTENSIONS:
+                await self.bot.reload_extension(extension)
+        except Exception as e:
+            await interaction.followup.send(f"Reload failed: `{e}`", ephemeral=True)
+            return
+
+        synced = await sync_if_changed(self.bot.tree)
+        await interaction.followup.send(
+            f"Reloaded {', '.join(RELOADABLE_MODULES)} and {len(EXTENSIONS)} extension(s). "
+            + ("Slash commands re-synced." if synced else "Slash commands unchanged, no sync needed."),
+            ephemeral=True
+        )
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Admin(bot))
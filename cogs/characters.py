@@ -0,0 +1,366 @@
+# cogs/characters.py — Character creation, sheets, condition and rolls
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from database import create_character
+from scene import get_character, update_character_field, save_last_roll
+from rules import rules_for
+from dice import roll_dice, panic_roll, format_dice_roll
+from expression import compile_expression
+import name_index
+from character import (
+    build_character_embed, CharacterSheetView, PushView,
+    format_table_roll, refresh_sheet
+)
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+async def remember_sheet(interaction: discord.Interaction):
+    """Note which message holds the user's sheet, so changes can refresh it."""
+    message = await interaction.original_response()
+    user_id = str(interaction.user.id)
+    await update_character_field(user_id, "sheet_message_id", str(message.id))
+    await update_character_field(user_id, "sheet_channel_id", str(message.channel.id))
+
+async def character_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggest characters in this server by name, from the in-memory index."""
+    return [
+        app_commands.Choice(name=name[:100], value=user_id)  # Discord caps choice names at 100
+        for name, user_id in name_index.search(str(interaction.guild_id), current)
+    ]
+
+
+async def target_character(interaction: discord.Interaction, character: str = None):
+    """
+    The character a command acts on: the caller's own, or another character
+    in this server picked by name (GMs with Manage Server only).
+    Returns (user_id, char), or (None, None) after telling the user why not.
+    """
+    user_id = str(interaction.user.id)
+    if character is None or character == user_id:
+        char = await get_character(user_id)
+        if not char:
+            await interaction.response.send_message(
+                "You don't have a character yet.", ephemeral=True
+            )
+            return None, None
+        return user_id, char
+
+    if not interaction.permissions.manage_guild:
+        await interaction.response.send_message(
+            "Only GMs (Manage Server) can do that to someone else's character.",
+            ephemeral=True
+        )
+        return None, None
+
+    char = await get_character(character)
+    if not char or char["discord_guild_id"] != str(interaction.guild_id):
+        await interaction.response.send_message(
+            "Character not found in this server.", ephemeral=True
+        )
+        return None, None
+    return character, char
+
+# ── Commands ──────────────────────────────────────────────────────────────────
+
+class Characters(commands.Cog):
+    """Player-facing commands for a single character."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="create_character", description="Create your Alien RPG character")
+    @app_commands.describe(
+        name="Your character's full name",
+        career="Your career (e.g. Colonial Marine, Roughneck, Medic)",
+        age="Your character's age",
+        strength="Strength attribute (1-5)",
+        agility="Agility attribute (1-5)",
+        wits="Wits attribute (1-5)",
+        empathy="Empathy attribute (1-5)",
+    )
+    async def create_character_cmd(
+        self,
+        interaction: discord.Interaction,
+        name: str,
+        career: str,
+        age: int,
+        strength: int,
+        agility: int,
+        wits: int,
+        empathy: int,
+    ):
+        # Check they don't already have a character
+        existing = await get_character(str(interaction.user.id))
+        if existing:
+            await interaction.response.send_message(
+                f"You already have a character: **{existing['name']}**. "
+                f"Use `/sheet` to view them.",
+                ephemeral=True
+            )
+            return
+
+        # Validate attributes
+        for label, val in [
+            ("Strength", strength), ("Agility", agility),
+            ("Wits", wits), ("Empathy", empathy)
+        ]:
+            if not 1 <= val <= 5:
+                await interaction.response.send_message(
+                    f"{label} must be between 1 and 5.", ephemeral=True
+                )
+                return
+
+        if not 16 <= age <= 60:
+            await interaction.response.send_message(
+                "Age must be between 16 and 60.", ephemeral=True
+            )
+            return
+
+        await create_character(
+            discord_user_id=str(interaction.user.id),
+            guild_id=str(interaction.guild_id),
+            name=name,
+            career=career,
+            age=age,
+            attributes={
+                "strength": strength,
+                "agility": agility,
+                "wits": wits,
+                "empathy": empathy,
+            },
+            skills={}  # Skills added separately via /train
+        )
+
+        char = await get_character(str(interaction.user.id))
+        embed = build_character_embed(char)
+        view = CharacterSheetView(char)
+
+        await interaction.response.send_message(
+            f"Welcome to the crew, **{name}**. Try not to die.",
+            embed=embed,
+            view=view
+        )
+        await remember_sheet(interaction)
+
+    @app_commands.command(name="sheet", description="Display a character sheet")
+    @app_commands.describe(character="Whose sheet to show (defaults to yours)")
+    @app_commands.autocomplete(character=character_autocomplete)
+    async def sheet_cmd(self, interaction: discord.Interaction, character: str = None):
+        own = character is None or character == str(interaction.user.id)
+        char = await get_character(str(interaction.user.id) if own else character)
+        if char and not own and char["discord_guild_id"] != str(interaction.guild_id):
+            char = None
+        if not char:
+            await interaction.response.send_message(
+                "You don't have a character yet. Use `/create_character` to make one."
+                if own else "Character not found.",
+                ephemeral=True
+            )
+            return
+
+        embed = build_character_embed(char)
+        view = CharacterSheetView(char)
+        await interaction.response.send_message(embed=embed, view=view)
+        if own:
+            await remember_sheet(interaction)
+
+    @app_commands.command(name="train", description="Add points to a skill")
+    @app_commands.describe(
+        skill="The skill to train",
+        points="Number of points to add (1-3)"
+    )
+    @app_commands.choices(skill=[
+        app_commands.Choice(name="Heavy Machinery", value="heavy_machinery"),
+        app_commands.Choice(name="Stamina", value="stamina"),
+        app_commands.Choice(name="Ranged Combat", value="ranged_combat"),
+        app_commands.Choice(name="Mobility", value="mobility"),
+        app_commands.Choice(name="Piloting", value="piloting"),
+        app_commands.Choice(name="Close Combat", value="close_combat"),
+        app_commands.Choice(name="Observation", value="observation"),
+        app_commands.Choice(name="Survival", value="survival"),
+        app_commands.Choice(name="Comtech", value="comtech"),
+        app_commands.Choice(name="Manipulation", value="manipulation"),
+        app_commands.Choice(name="Medical Aid", value="medical_aid"),
+        app_commands.Choice(name="Command", value="command"),
+    ])
+    async def train_cmd(self, interaction: discord.Interaction, skill: str, points: int):
+        char = await get_character(str(interaction.user.id))
+        if not char:
+            await interaction.response.send_message(
+                "You don't have a character yet.", ephemeral=True
+            )
+            return
+
+        if not 1 <= points <= 3:
+            await interaction.response.send_message(
+                "Points must be between 1 and 3.", ephemeral=True
+            )
+            return
+
+        new_val = min(char[skill] + points, 5)
+        await update_character_field(str(interaction.user.id), skill, new_val)
+
+        await interaction.response.send_message(
+            f"**{char['name']}** trained **{skill.replace('_', ' ').title()}** "
+            f"to level {new_val}.",
+            ephemeral=True
+        )
+        await refresh_sheet(str(interaction.user.id))
+
+    @app_commands.command(name="damage", description="Apply damage to a character")
+    @app_commands.describe(
+        amount="Amount of damage to take",
+        character="GM only: whose character (defaults to yours)"
+    )
+    @app_commands.autocomplete(character=character_autocomplete)
+    async def damage_cmd(
+        self, interaction: discord.Interaction, amount: int, character: str = None
+    ):
+        user_id, char = await target_character(interaction, character)
+        if not char:
+            return
+
+        new_health = max(char["health"] - amount, 0)
+        await update_character_field(user_id, "health", new_health)
+
+        status = "still standing" if new_health > 0 else "**BROKEN**"
+        await interaction.response.send_message(
+            f"**{char['name']}** takes {amount} damage. "
+            f"Health: {new_health}/{char['max_health']} — {status}"
+        )
+        await refresh_sheet(user_id)
+
+    @app_commands.command(name="heal", description="Recover health")
+    @app_commands.describe(
+        amount="Amount of health to recover",
+        character="GM only: whose character (defaults to yours)"
+    )
+    @app_commands.autocomplete(character=character_autocomplete)
+    async def heal_cmd(
+        self, interaction: discord.Interaction, amount: int, character: str = None
+    ):
+        user_id, char = await target_character(interaction, character)
+        if not char:
+            return
+
+        new_health = min(char["health"] + amount, char["max_health"])
+        await update_character_field(user_id, "health", new_health)
+
+        await interaction.response.send_message(
+            f"**{char['name']}** recovers {amount} health. "
+            f"Health: {new_health}/{char['max_health']}"
+        )
+        await refresh_sheet(user_id)
+
+    @app_commands.command(name="stress", description="Adjust stress level")
+    @app_commands.describe(
+        amount="Stress to add (positive) or remove (negative)",
+        character="GM only: whose character (defaults to yours)",
+    )
+    @app_commands.autocomplete(character=character_autocomplete)
+    async def stress_cmd(
+        self, interaction: discord.Interaction, amount: int, character: str = None
+    ):
+        user_id, char = await target_character(interaction, character)
+        if not char:
+            return
+
+        new_stress = max(0, min(char["stress"] + amount, 10))
+        await update_character_field(user_id, "stress", new_stress)
+
+        direction = "gains" if amount > 0 else "loses"
+        await interaction.response.send_message(
+            f"**{char['name']}** {direction} {abs(amount)} stress. "
+            f"Stress: {new_stress}/10"
+        )
+        await refresh_sheet(user_id)
+
+    @app_commands.command(name="resolve", description="Set Resolve, which steadies Panic Rolls in some rule sets")
+    @app_commands.describe(
+        value="New Resolve (0-5)",
+        character="GM only: whose character (defaults to yours)",
+    )
+    @app_commands.autocomplete(character=character_autocomplete)
+    async def resolve_cmd(
+        self, interaction: discord.Interaction, value: int, character: str = None
+    ):
+        if not 0 <= value <= 5:
+            await interaction.response.send_message(
+                "Resolve must be between 0 and 5.", ephemeral=True
+            )
+            return
+
+        user_id, char = await target_character(interaction, character)
+        if not char:
+            return
+
+        await update_character_field(user_id, "resolve", value)
+
+        note = ""
+        if not rules_for(char["discord_guild_id"]).uses_resolve:
+            note = " (this server's rule set doesn't use Resolve)"
+        await interaction.response.send_message(
+            f"**{char['name']}**'s Resolve is now {value}.{note}"
+        )
+        await refresh_sheet(user_id)
+
+    @app_commands.command(name="roll", description="Roll a skill or attribute with modifiers")
+    @app_commands.describe(
+        expression="e.g. 'Ranged Combat +2 weapon, -1 darkness', 'agility stress 0', 'base 4 +1'"
+    )
+    async def roll_cmd(self, interaction: discord.Interaction, expression: str):
+        user_id = str(interaction.user.id)
+        char = await get_character(user_id)
+        if not char:
+            await interaction.response.send_message(
+                "You don't have a character yet.", ephemeral=True
+            )
+            return
+
+        try:
+            plan = compile_expression(expression)
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
+            return
+
+        rules = rules_for(char["discord_guild_id"])
+        base_dice, stress_dice = plan.dice_for(char)
+        result = roll_dice(base_dice=base_dice, stress_dice=stress_dice)
+        formatted = format_dice_roll(result, plan.label, rules.stress_bane.title)
+
+        await save_last_roll(user_id, result, plan.label)
+
+        if result["panic_triggered"]:
+            new_stress = min(char["stress"] + 1, 10)
+            await update_character_field(user_id, "stress", new_stress)
+            pr = panic_roll(new_stress, rules.stress_bane, char["resolve"])
+            formatted += format_table_roll(pr)
+
+        if result["pushable"]:
+            await interaction.response.send_message(formatted, view=PushView(user_id))
+        else:
+            await interaction.response.send_message(formatted)
+
+        if result["panic_triggered"]:
+            await refresh_sheet(user_id)
+
+    @app_commands.command(name="panic", description="Make a Panic Roll")
+    async def panic_cmd(self, interaction: discord.Interaction):
+        char = await get_character(str(interaction.user.id))
+        if not char:
+            await interaction.response.send_message(
+                "You don't have a character yet.", ephemeral=True
+            )
+            return
+
+        rules = rules_for(char["discord_guild_id"])
+        pr = panic_roll(char["stress"], rules.panic, char["resolve"])
+        await interaction.response.send_message(
+            f"**{char['name']}** fights to keep it together..." + format_table_roll(pr)
+        )
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Characters(bot))
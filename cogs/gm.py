@@ -0,0 +1,79 @@
+# cogs/gm.py — Server and GM tools: broadcasts, rule sets, metrics
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from rules import rule_set_names, set_guild_rule_set
+from outbound import scheduler
+import metrics
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+async def rule_set_autocomplete(interaction: discord.Interaction, current: str):
+    return [
+        app_commands.Choice(name=name, value=key)
+        for key, name in rule_set_names().items()
+        if current.lower() in name.lower() or current.lower() in key
+    ][:25]
+
+# ── Commands ──────────────────────────────────────────────────────────────────
+
+class GM(commands.Cog):
+    """Commands for whoever runs the server and the game."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="broadcast", description="Post a GM announcement to a channel")
+    @app_commands.describe(
+        message="What to announce",
+        channel="Where to post it (defaults to this channel)"
+    )
+    @app_commands.default_permissions(manage_guild=True)
+    async def broadcast_cmd(
+        self,
+        interaction: discord.Interaction,
+        message: app_commands.Range[str, 1, 1990],  # Room for the 📢 within Discord's 2000
+        channel: discord.TextChannel = None,
+    ):
+        target = channel or interaction.channel
+        scheduler.send(str(target.id), content=f"📢 {message}")
+        await interaction.response.send_message(
+            f"Announcement queued for {target.mention}.", ephemeral=True
+        )
+
+    @app_commands.command(name="metrics", description="Show bot health metrics")
+    @app_commands.default_permissions(administrator=True)
+    async def metrics_cmd(self, interaction: discord.Interaction):
+        lines = []
+        for source, values in metrics.collect().items():
+            lines.append(f"[{source}]")
+            lines.extend(f"  {name}: {value}" for name, value in values.items())
+        await interaction.response.send_message(
+            "```\n" + "\n".join(lines) + "\n```", ephemeral=True
+        )
+
+    @app_commands.command(name="ruleset", description="Choose which rule tables this server plays with")
+    @app_commands.describe(rule_set="The rule set to use (e.g. Classic, Evolved Edition)")
+    @app_commands.autocomplete(rule_set=rule_set_autocomplete)
+    @app_commands.default_permissions(manage_guild=True)
+    async def ruleset_cmd(self, interaction: discord.Interaction, rule_set: str):
+        if interaction.guild_id is None:
+            await interaction.response.send_message(
+                "Rule sets can only be chosen in a server.", ephemeral=True
+            )
+            return
+
+        try:
+            rules = await set_guild_rule_set(str(interaction.guild_id), rule_set)
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
+            return
+
+        await interaction.response.send_message(
+            f"This server now plays with the **{rules.name}** rules."
+        )
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(GM(bot))
@@ -0,0 +1,79 @@
+# cogs/scenes.py — /scene commands for write-behind combat scenes
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from scene import active_scene, start_scene, end_scene
+
+
+class Scenes(
+    commands.GroupCog,
+    group_name="scene",
+    group_description="Run a combat scene (condition kept in memory)",
+):
+    """Start, run and end a server's combat scene."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        super().__init__()
+
+    @app_commands.command(name="start", description="Start a combat scene in this server")
+    async def scene_start_cmd(self, interaction: discord.Interaction):
+        if interaction.guild_id is None:
+            await interaction.response.send_message(
+                "Scenes can only be run in a server.", ephemeral=True
+            )
+            return
+
+        try:
+            scene = await start_scene(str(interaction.guild_id), str(interaction.channel_id))
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
+            return
+
+        await interaction.response.send_message(
+            f"**Combat scene started.** {len(scene.characters)} character(s) in play. "
+            f"Use `/scene end` when the shooting stops."
+        )
+
+    @app_commands.command(name="initiative", description="Deal initiative cards for the scene")
+    async def scene_initiative_cmd(self, interaction: discord.Interaction):
+        scene = active_scene(str(interaction.guild_id))
+        if scene is None:
+            await interaction.response.send_message(
+                "No scene running. Use `/scene start` first.", ephemeral=True
+            )
+            return
+
+        order = scene.deal_initiative()
+        if not order:
+            await interaction.response.send_message(
+                "No characters in this scene.", ephemeral=True
+            )
+            return
+
+        lines = [
+            f"`{card:>2}` {scene.characters[user_id]['name']}"
+            for user_id, card in order
+        ]
+        await interaction.response.send_message(
+            "**Initiative**\n" + "\n".join(lines)
+        )
+
+    @app_commands.command(name="end", description="End the combat scene and save everyone")
+    async def scene_end_cmd(self, interaction: discord.Interaction):
+        scene = await end_scene(str(interaction.guild_id))
+        if scene is None:
+            await interaction.response.send_message(
+                "No scene is running.", ephemeral=True
+            )
+            return
+
+        await interaction.response.send_message(
+            f"**Scene over.** {len(scene.events)} change(s) saved for "
+            f"{len(scene.characters)} character(s)."
+        )
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Scenes(bot))
@@ -0,0 +1,46 @@
+# commandsync.py — Sync slash commands with Discord only when they change
+#
+# tree.sync() is rate limited and slow, and most restarts and reloads don't
+# touch any command's name, options or description. A hash of the command
+# definitions is kept on disk and the sync is skipped when it matches.
+import hashlib
+import json
+import os
+
+from discord import app_commands
+
+SIGNATURE_PATH = "data/command_tree.sha256"
+
+
+def tree_signature(tree: app_commands.CommandTree) -> str:
+    """Hash of every global command definition as Discord would see it."""
+    definitions = sorted(
+        (command.to_dict(tree) for command in tree.get_commands()),
+        key=lambda definition: definition["name"]
+    )
+    payload = json.dumps(
+        [tree.client.application_id, definitions], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def sync_if_changed(tree: app_commands.CommandTree) -> bool:
+    """
+    Sync the command tree if it differs from the last sync.
+    Returns True if a sync was done.
+    """
+    signature = tree_signature(tree)
+    try:
+        with open(SIGNATURE_PATH, encoding="utf-8") as f:
+            if f.read().strip() == signature:
+                print("Slash commands unchanged — skipping sync")
+                return False
+    except FileNotFoundError:
+        pass
+
+    synced = await tree.sync()
+    os.makedirs(os.path.dirname(SIGNATURE_PATH), exist_ok=True)
+    with open(SIGNATURE_PATH, "w", encoding="utf-8") as f:
+        f.write(signature)
+    print(f"Synced {len(synced)} slash command(s)")
+    return True
@@ -3,6 +3,8 @@ import aiosqlite
 import json
 import os
 
+import name_index
+
 DB_PATH = "data/typhon.db"
 
 async def init_db():
@@ -11,6 +13,11 @@ async def init_db():
     Called once when the bot starts up.
     """
     async with aiosqlite.connect(DB_PATH) as db:
+        # WAL lets backups and readers run alongside writes; incremental
+        # auto-vacuum lets maintenance reclaim space a little at a time.
+        # (auto_vacuum only takes effect here on a brand new database.)
+        await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        await db.execute("PRAGMA journal_mode = WAL")
         await db.execute("""
             CREATE TABLE IF NOT EXISTS characters (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -44,6 +51,7 @@ async def init_db():
                 health INTEGER DEFAULT 3,
                 max_health INTEGER DEFAULT 3,
                 stress INTEGER DEFAULT 0,
+                resolve INTEGER DEFAULT 0,
 
                 -- Sheet message (so we can update it in Discord)
                 sheet_message_id TEXT DEFAULT NULL,
@@ -57,6 +65,26 @@ async def init_db():
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        # Columns added since the table was first created
+        async with db.execute("PRAGMA table_info(characters)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        if "resolve" not in columns:
+            await db.execute("ALTER TABLE characters ADD COLUMN resolve INTEGER DEFAULT 0")
+
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS scene_snapshots (
+                discord_guild_id TEXT PRIMARY KEY,
+                discord_channel_id TEXT,
+                state TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS guild_settings (
+                discord_guild_id TEXT PRIMARY KEY,
+                rule_set TEXT NOT NULL
+            )
+        """)
         await db.commit()
     print(f"Database initialised at {DB_PATH}")
 
@@ -105,6 +133,7 @@ async def create_character(discord_user_id: str, guild_id: str, name: str,
             attributes.get("strength", 2),  # health starts at max
         ))
         await db.commit()
+    name_index.add(guild_id, discord_user_id, name)
 
 
 async def get_character(discord_user_id: str):
@@ -131,7 +160,7 @@ async def update_character_field(discord_user_id: str, field: str, value):
     """
     # Whitelist of fields that can be updated this way (security measure)
     allowed_fields = {
-        "health", "stress", "strength", "agility", "wits", "empathy",
+        "health", "stress", "resolve", "strength", "agility", "wits", "empathy",
         "heavy_machinery", "stamina", "ranged_combat", "mobility", "piloting",
         "close_combat", "observation", "survival", "comtech",
         "manipulation", "medical_aid", "command",
@@ -185,3 +214,106 @@ async def delete_character(discord_user_id: str):
             (discord_user_id,)
         )
         await db.commit()
+    name_index.remove(discord_user_id)
+
+
+async def get_guild_characters(guild_id: str):
+    """
+    Fetch every character in a server.
+    Returns a list of dicts (empty if there are none).
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            "SELECT * FROM characters WHERE discord_guild_id = ?",
+            (guild_id,)
+        ) as cursor:
+            return [dict(row) for row in await cursor.fetchall()]
+
+
+async def get_character_names():
+    """
+    Fetch (guild_id, user_id, name) for every character.
+    Used to build the autocomplete name index on startup.
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            "SELECT discord_guild_id, discord_user_id, name FROM characters"
+        ) as cursor:
+            return await cursor.fetchall()
+
+
+async def finish_scene(guild_id: str, conditions: list):
+    """
+    Write back health, stress and last roll for every character in a scene
+    and delete the scene's snapshot, in one transaction, so a crash can
+    never leave a finished scene behind to be restored over the write-back.
+    Each condition is a dict with discord_user_id, health, stress,
+    last_roll (JSON string or None) and last_roll_skill.
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.executemany("""
+            UPDATE characters
+            SET health = :health, stress = :stress,
+                last_roll = :last_roll, last_roll_skill = :last_roll_skill,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE discord_user_id = :discord_user_id
+        """, conditions)
+        await db.execute(
+            "DELETE FROM scene_snapshots WHERE discord_guild_id = ?",
+            (guild_id,)
+        )
+        await db.commit()
+
+
+async def save_scene_snapshot(guild_id: str, channel_id: str, state: dict):
+    """
+    Store (or replace) the latest snapshot of a server's combat scene.
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("""
+            INSERT INTO scene_snapshots (discord_guild_id, discord_channel_id, state)
+            VALUES (?, ?, ?)
+            ON CONFLICT(discord_guild_id) DO UPDATE SET
+                discord_channel_id = excluded.discord_channel_id,
+                state = excluded.state,
+                updated_at = CURRENT_TIMESTAMP
+        """, (guild_id, channel_id, json.dumps(state)))
+        await db.commit()
+
+
+async def get_scene_snapshots():
+    """
+    Fetch every stored scene snapshot, for crash recovery on startup.
+    Returns a list of (guild_id, channel_id, state_dict).
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            "SELECT discord_guild_id, discord_channel_id, state FROM scene_snapshots"
+        ) as cursor:
+            rows = await cursor.fetchall()
+    return [(guild_id, channel_id, json.loads(state)) for guild_id, channel_id, state in rows]
+
+
+async def get_guild_rule_sets():
+    """
+    Fetch every server's chosen rule set.
+    Returns a dict of guild_id → rule set key.
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            "SELECT discord_guild_id, rule_set FROM guild_settings"
+        ) as cursor:
+            return dict(await cursor.fetchall())
+
+
+async def set_guild_rule_set(guild_id: str, rule_set: str):
+    """
+    Store a server's chosen rule set.
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("""
+            INSERT INTO guild_settings (discord_guild_id, rule_set) VALUES (?, ?)
+            ON CONFLICT(discord_guild_id) DO UPDATE SET rule_set = excluded.rule_set
+        """, (guild_id, rule_set))
+        await db.commit()
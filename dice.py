@@ -1,24 +1,7 @@
 # dice.py — Year Zero Engine dice mechanics for In Search of Typhon
 import random
 
-# Panic table from Alien RPG Evolved Edition
-PANIC_TABLE = {
-    1:  "Keeping it together. No effect.",
-    2:  "Trembling. -1 to all rolls until end of next turn.",
-    3:  "Dropping things. Drop whatever you're holding.",
-    4:  "Freezing. Lose your next slow action.",
-    5:  "Seeking cover. Must move to nearest cover immediately.",
-    6:  "Screaming. Lose both actions next turn.",
-    7:  "Fleeing. Must move away from threat as fast as possible.",
-    8:  "Berserk. Attack nearest person (friend or foe) next turn.",
-    9:  "Catatonic. Can't act until someone snaps you out of it.",
-    10: "Cardiac arrest. Take 1 damage, lose all actions next turn.",
-    11: "Permanent PTSD. Gain a permanent mental trauma.",
-    12: "Spreading panic. All allies must make a Panic Roll.",
-    13: "Heart attack. Broken immediately.",
-    14: "Comatose. Unconscious until end of scene.",
-    15: "Death wish. Actively try to get yourself killed this scene.",
-}
+# Panic and stress response tables live in rules/ and are compiled by rules.py
 
 def roll_dice(base_dice: int, stress_dice: int = 0):
     """
@@ -103,36 +86,66 @@ def push_roll(previous_roll: dict):
         "was_pushed": True,
     }
 
-def panic_roll(stress: int):
+def panic_roll(stress: int, table, resolve: int = 0):
     """
-    Roll on the panic table.
-    Roll 1D6 and add current Stress, capped at 15.
+    Roll on a compiled table (see rules.RollTable).
+    Roll 1D6, add Stress and subtract Resolve as the table says,
+    then clamp to the table's range.
     """
     roll = random.randint(1, 6)
-    result = min(roll + stress, 15)
+    total = roll + stress * table.stress_factor - resolve * table.resolve_factor
+    result = min(max(total, table.low), table.high)
     return {
+        "title": table.title,
         "d6_roll": roll,
         "stress": stress,
+        "resolve": resolve if table.resolve_factor else 0,
         "total": result,
-        "effect": PANIC_TABLE[result],
+        "effect": table.effects[result],
     }
 
-def format_dice_roll(result: dict, skill_name: str = "Roll") -> str:
-    """
-    Format a roll result as a readable string for Discord.
-    """
-
-    # Build visual dice display
-    def dice_emoji(value, is_stress=False):
-        if value == 6:
-            return "✅"  # Success
-        elif value == 1:
-            return "💀" if is_stress else "⚠️"  # Panic / Bane
-        else:
-            return f"[{value}]"
-
-    base_display = " ".join(dice_emoji(d) for d in result["base_results"])
-    stress_display = " ".join(dice_emoji(d, is_stress=True) for d in result["stress_results"])
+# Glyph for each die face (index 0 unused), built once rather than per die
+BASE_GLYPHS = ("", "⚠️", "[2]", "[3]", "[4]", "[5]", "✅")    # 1 = Bane
+STRESS_GLYPHS = ("", "💀", "[2]", "[3]", "[4]", "[5]", "✅")  # 1 = Panic
+
+# Dice on one line before they are shown as grouped counts (✅×3 [2-5]×7 💀×1)
+COMPACT_THRESHOLD = 12
+
+# Most a formatted roll may take, in UTF-8 bytes. Discord allows 2000
+# characters; the rest is headroom for the panic/stress response text.
+MESSAGE_BUDGET = 1800
+
+def _dice_line(results: list, successes: int, ones: int, glyphs: tuple, compact: bool) -> str:
+    """One line of dice, either die by die or as grouped counts."""
+    if not compact:
+        return " ".join([glyphs[d] for d in results])
+
+    groups = []
+    if successes:
+        groups.append(f"{glyphs[6]}×{successes}")
+    blanks = len(results) - successes - ones
+    if blanks:
+        groups.append(f"[2-5]×{blanks}")
+    if ones:
+        groups.append(f"{glyphs[1]}×{ones}")
+    return " ".join(groups)
+
+def _fit(text: str, budget: int) -> str:
+    """Cut text down to the byte budget without splitting a character."""
+    data = text.encode("utf-8")
+    if len(data) <= budget:
+        return text
+    return data[:budget - 3].decode("utf-8", errors="ignore") + "…"
+
+def _render(result: dict, skill_name: str, trigger: str, compact: bool) -> str:
+    base_display = _dice_line(
+        result["base_results"], result["base_successes"], result["base_banes"],
+        BASE_GLYPHS, compact
+    )
+    stress_display = _dice_line(
+        result["stress_results"], result["stress_successes"], result["stress_banes"],
+        STRESS_GLYPHS, compact
+    )
 
     lines = []
     lines.append(f"**{skill_name}**" + (" *(Pushed)*" if result["was_pushed"] else ""))
@@ -154,8 +167,27 @@ def format_dice_roll(result: dict, skill_name: str = "Roll") -> str:
         lines.append(f"⚠️ {result['base_banes']} bane(s) on base dice")
 
     if result["panic_triggered"]:
-        lines.append(f"💀 **PANIC TRIGGERED** — roll on the panic table!")
+        lines.append(f"💀 **{trigger.upper()} TRIGGERED** — roll on the {trigger.lower()} table!")
     elif result["pushable"] and not result["was_pushed"]:
         lines.append("*You may Push this roll (costs 1 Stress)*")
 
     return "\n".join(lines)
+
+def format_dice_roll(result: dict, skill_name: str = "Roll", trigger: str = "Panic",
+                     budget: int = MESSAGE_BUDGET) -> str:
+    """
+    Format a roll result as a readable string for Discord.
+    Large pools are shown as grouped counts, and the output never goes
+    over `budget` bytes.
+    """
+    compact = max(len(result["base_results"]), len(result["stress_results"])) > COMPACT_THRESHOLD
+    text = _render(result, skill_name, trigger, compact)
+    if not compact and len(text.encode("utf-8")) > budget:
+        text = _render(result, skill_name, trigger, compact=True)
+
+    # Still too long? Only the name can be that big — shorten it, not the dice
+    over = len(text.encode("utf-8")) - budget
+    if over > 0:
+        name = _fit(skill_name, max(len(skill_name.encode("utf-8")) - over, 3))
+        text = _render(result, name, trigger, compact=True)
+    return _fit(text, budget)
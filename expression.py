@@ -0,0 +1,153 @@
+# expression.py — Dice expressions for the /roll command
+#
+#   ranged combat +2 from weapon, -1 darkness
+#   agility -1
+#   observation stress 0
+#   base 4 stress 2 +1
+#
+# A skill or attribute name comes first (or `base N` instead), followed by any
+# number of ±N modifiers with optional reasons, and `stress N` to override the
+# number of stress dice.
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+from character import SKILLS
+
+ATTRIBUTES = {
+    "strength": "Strength",
+    "agility": "Agility",
+    "wits": "Wits",
+    "empathy": "Empathy",
+}
+
+# Everything a roll can be named by → (attribute, skill or None, display label)
+NAMES = {}
+for _attr, _label in ATTRIBUTES.items():
+    NAMES[_attr] = (_attr, None, _label)
+    NAMES[_attr[:3]] = (_attr, None, _label)  # STR / AGI / WIT / EMP
+for _skill, (_attr, _label) in SKILLS.items():
+    NAMES[_label.lower()] = (_attr, _skill, _label)
+
+KEYWORDS = {"base", "stress"}
+FILLER = {"from", "for"}
+
+TOKEN = re.compile(
+    r"\s*(?:(?P<mod>[+-]\s*\d+)|(?P<num>\d+)|(?P<word>[a-z][a-z_']*)|(?P<comma>,))"
+)
+
+CACHE_SIZE = 512
+MAX_DICE = 30  # Most dice in either pool; also caps a single ± modifier
+
+
+class RollPlan(NamedTuple):
+    """A compiled /roll expression, ready to be applied to any character."""
+
+    attribute: str | None  # None when the pool is given with `base N`
+    skill: str | None      # None for a raw attribute roll
+    base: int | None       # Explicit base dice, or None to use attribute + skill
+    stress: int | None     # Explicit stress dice, or None to use current Stress
+    modifier: int          # Sum of every ± modifier
+    label: str             # Name and modifiers, for the roll output
+
+    def dice_for(self, char: dict):
+        """Return (base_dice, stress_dice) for this character."""
+        if self.base is not None:
+            base = self.base
+        else:
+            base = char[self.attribute] + (char[self.skill] if self.skill else 0)
+        stress = char["stress"] if self.stress is None else self.stress
+        return max(0, min(base + self.modifier, MAX_DICE)), max(0, min(stress, MAX_DICE))
+
+
+def _tokenize(text: str):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = TOKEN.match(text, pos)
+        if match is None:
+            raise ValueError(f"Couldn't read `{text[pos:].strip()}`.")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        pos = match.end()
+    return tokens
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile(text: str) -> RollPlan:
+    tokens = _tokenize(text)
+    name_words = []
+    modifiers = []
+    base = stress = None
+
+    i = 0
+    while i < len(tokens):
+        kind, value = tokens[i]
+
+        if kind == "word" and value in KEYWORDS:
+            if i + 1 >= len(tokens) or tokens[i + 1][0] != "num":
+                raise ValueError(f"`{value}` needs a number of dice, e.g. `{value} 3`.")
+            dice = int(tokens[i + 1][1])
+            if dice > MAX_DICE:
+                raise ValueError(f"`{value}` can be at most {MAX_DICE} dice.")
+            if value == "base":
+                base = dice
+            else:
+                stress = dice
+            i += 2
+
+        elif kind == "mod":
+            amount = int(value.replace(" ", ""))
+            if abs(amount) > MAX_DICE:
+                raise ValueError(f"Modifiers can be at most ±{MAX_DICE} dice (found `{value}`).")
+            reason = []
+            i += 1
+            while i < len(tokens) and tokens[i][0] == "word" and tokens[i][1] not in KEYWORDS:
+                if tokens[i][1] not in FILLER:
+                    reason.append(tokens[i][1])
+                i += 1
+            modifiers.append((amount, " ".join(reason)))
+
+        elif kind == "word":
+            if modifiers or base is not None or stress is not None:
+                raise ValueError(f"Put the skill or attribute first (found `{value}` later on).")
+            name_words.append(value.replace("_", " "))
+            i += 1
+
+        elif kind == "num":
+            raise ValueError(f"Put a + or - in front of `{value}` to use it as a modifier.")
+
+        else:  # comma between modifiers
+            i += 1
+
+    name = " ".join(name_words)
+    if name:
+        if name not in NAMES:
+            raise ValueError(f"Unknown skill or attribute `{name}`.")
+        if base is not None:
+            raise ValueError("Use either a skill/attribute or `base N`, not both.")
+        attribute, skill, label = NAMES[name]
+    elif base is not None:
+        attribute, skill, label = None, None, f"{base} Dice"
+    else:
+        raise ValueError("Say what to roll: a skill, an attribute or `base N`.")
+
+    for amount, reason in modifiers:
+        label += f" {amount:+d}" + (f" ({reason})" if reason else "")
+
+    return RollPlan(
+        attribute=attribute,
+        skill=skill,
+        base=base,
+        stress=stress,
+        modifier=sum(amount for amount, _ in modifiers),
+        label=label,
+    )
+
+
+def compile_expression(text: str) -> RollPlan:
+    """
+    Compile a /roll expression, reusing the cached plan for repeated text.
+    Raises ValueError with a player-facing message if it can't be read.
+    """
+    return _compile(" ".join(text.lower().split()))
@@ -0,0 +1,94 @@
+# gateway.py — Gateway profiles (intents and caches) and the startup report
+#
+# Everything the bot does arrives as a slash command or button interaction,
+# and interactions are delivered whatever the intents. The "lean" profile
+# therefore only asks for guild events and keeps no member or message cache.
+# "full" is the old setup, kept so the two can be compared.
+import os
+import time
+
+import discord
+
+import metrics
+
+_launched_at = time.perf_counter()
+_launch_rss = None
+_reported = False
+
+
+def current_profile() -> str:
+    """The gateway profile chosen with TYPHON_GATEWAY_PROFILE (default: lean)."""
+    return os.getenv("TYPHON_GATEWAY_PROFILE", "lean")
+
+
+def gateway_options(profile: str = None) -> dict:
+    """Keyword arguments for the Bot constructor for a gateway profile."""
+    profile = profile or current_profile()
+    if profile == "full":
+        intents = discord.Intents.default()
+        intents.message_content = True
+        intents.members = True
+        return {"intents": intents}
+
+    if profile != "lean":
+        raise ValueError(f"Unknown gateway profile '{profile}' (use 'lean' or 'full')")
+
+    intents = discord.Intents.none()
+    intents.guilds = True  # Guild and channel cache, for posting sheets and broadcasts
+    return {
+        "intents": intents,
+        "member_cache_flags": discord.MemberCacheFlags.none(),
+        "chunk_guilds_at_startup": False,
+        "max_messages": None,
+    }
+
+# ── Memory report ─────────────────────────────────────────────────────────────
+
+def rss_mb():
+    """Current resident memory in MB, or None where /proc isn't available."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _fmt_mb(value) -> str:
+    return "n/a" if value is None else f"{value:.1f} MB"
+
+
+def record_launch():
+    """Note memory before connecting, as the baseline for the report."""
+    global _launch_rss
+    _launch_rss = rss_mb()
+
+
+def report_ready(client: discord.Client):
+    """Print the startup time and memory report (once, on the first ready)."""
+    global _reported
+    if _reported:
+        return
+    _reported = True
+
+    members = sum(len(guild.members) for guild in client.guilds)
+    print(
+        f"Gateway profile '{current_profile()}': ready in {time.perf_counter() - _launched_at:.1f}s, "
+        f"memory {_fmt_mb(_launch_rss)} at launch → {_fmt_mb(rss_mb())} when ready, "
+        f"{len(client.guilds)} server(s), {members} cached member(s)"
+    )
+
+
+def gateway_metrics(client: discord.Client) -> dict:
+    rss = rss_mb()
+    return {
+        "profile": current_profile(),
+        "rss_mb": round(rss, 1) if rss is not None else "n/a",
+        "guilds": len(client.guilds),
+        "cached_members": sum(len(guild.members) for guild in client.guilds),
+        "cached_messages": len(client.cached_messages),
+    }
+
+
+def register_metrics(client: discord.Client):
+    metrics.register("gateway", lambda: gateway_metrics(client))
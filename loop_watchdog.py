@@ -0,0 +1,156 @@
+# loop_watchdog.py — Event-loop stall detector (opt-in with TYPHON_WATCHDOG=1)
+#
+# A heartbeat task on the loop measures lag: how late each short sleep wakes
+# up. A sampler thread watches the heartbeat, and when the loop hasn't checked
+# in for longer than the threshold it grabs the loop thread's current stack —
+# the code that is blocking — and logs it with the command or button that
+# was running.
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+import discord
+
+import metrics
+from background import start_loop
+
+HEARTBEAT_INTERVAL = 0.1  # Seconds between heartbeats
+LAG_SAMPLES = 3000        # Recent lag samples kept (~5 minutes of heartbeats)
+DEFAULT_THRESHOLD = 0.25  # Seconds of lag that count as a stall
+
+
+def enabled() -> bool:
+    return os.getenv("TYPHON_WATCHDOG", "") not in ("", "0", "false", "no")
+
+
+def stall_threshold() -> float:
+    """
+    Seconds of lag before the loop counts as blocked.
+    A bad TYPHON_WATCHDOG_THRESHOLD is reported and the default used instead.
+    """
+    setting = os.getenv("TYPHON_WATCHDOG_THRESHOLD")
+    if setting is None:
+        return DEFAULT_THRESHOLD
+    try:
+        threshold = float(setting)
+    except ValueError:
+        threshold = None
+    if threshold is None or threshold <= HEARTBEAT_INTERVAL:
+        print(
+            f"Watchdog: TYPHON_WATCHDOG_THRESHOLD={setting!r} must be a number above the "
+            f"{HEARTBEAT_INTERVAL}s heartbeat; using {DEFAULT_THRESHOLD}s"
+        )
+        return DEFAULT_THRESHOLD
+    return threshold
+
+# ── Blame ─────────────────────────────────────────────────────────────────────
+
+def _describe_interaction(interaction: discord.Interaction) -> str:
+    if interaction.command is not None:
+        return f"/{interaction.command.qualified_name} (user {interaction.user.id})"
+    custom_id = (interaction.data or {}).get("custom_id", "?")
+    return f"component '{custom_id}' (user {interaction.user.id})"
+
+
+def _blame(frame) -> str:
+    """Find the interaction being handled by walking up the blocked stack."""
+    while frame is not None:
+        interaction = frame.f_locals.get("interaction")
+        if isinstance(interaction, discord.Interaction):
+            return _describe_interaction(interaction)
+        frame = frame.f_back
+    return "no command (background task or library code)"
+
+# ── Watchdog ──────────────────────────────────────────────────────────────────
+
+class Watchdog:
+    """Heartbeat on the event loop plus a sampler thread watching it."""
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.lags = deque(maxlen=LAG_SAMPLES)
+        self.stalls = 0
+        self.worst_lag = 0.0
+        self.last_beat = time.monotonic()
+        self.loop_thread_id = None
+        self._reported_beat = None  # So one long stall is only logged once
+        self._thread = None
+
+    def start(self):
+        """Start the heartbeat, and the sampler thread the first time round."""
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        if not start_loop("watchdog-heartbeat", self._heartbeat):
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._sample, name="typhon-watchdog", daemon=True
+            )
+            self._thread.start()
+        print(f"Watchdog: watching the event loop (stall threshold {self.threshold * 1000:.0f} ms)")
+
+    async def _heartbeat(self):
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            now = time.monotonic()
+            lag = max(now - before - HEARTBEAT_INTERVAL, 0.0)
+            self.last_beat = now
+            self.lags.append(lag)
+            self.worst_lag = max(self.worst_lag, lag)
+            if lag >= self.threshold:
+                print(f"Watchdog: event loop recovered after {lag * 1000:.0f} ms of lag")
+
+    def _sample(self):
+        # Runs in its own thread, so it keeps going while the loop is stuck
+        while True:
+            time.sleep(self.threshold / 2)
+            try:
+                self._check()
+            except Exception as e:  # A bad sample must never stop the watchdog
+                print(f"Watchdog: sampling failed: {e}")
+
+    def _check(self):
+        beat = self.last_beat
+        # The heartbeat is asleep on purpose for HEARTBEAT_INTERVAL; only the
+        # time beyond that is lag, the same measure the heartbeat records.
+        stalled = time.monotonic() - beat - HEARTBEAT_INTERVAL
+        if stalled < self.threshold or beat == self._reported_beat:
+            return
+
+        self._reported_beat = beat
+        self.stalls += 1
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return
+        stack = "".join(traceback.format_stack(frame))
+        print(
+            f"Watchdog: event loop blocked for {stalled * 1000:.0f} ms+ "
+            f"in {_blame(frame)}\n{stack}"
+        )
+
+    def metrics(self) -> dict:
+        lags = metrics.percentiles(self.lags)
+        return {
+            **{f"lag_{p}_ms": round(value * 1000, 1) for p, value in lags.items()},
+            "lag_max_ms": round(self.worst_lag * 1000, 1),
+            "stalls": self.stalls,
+        }
+
+
+_watchdog = None
+
+
+def start_watchdog():
+    """Start the watchdog if TYPHON_WATCHDOG is set; otherwise do nothing."""
+    global _watchdog
+    if not enabled():
+        return
+    if _watchdog is None:
+        _watchdog = Watchdog(stall_threshold())
+        metrics.register("event_loop", _watchdog.metrics)
+    _watchdog.start()
@@ -0,0 +1,116 @@
+# maintenance.py — Online backups and scheduled upkeep for the database
+import asyncio
+import glob
+import os
+import time
+from datetime import datetime
+
+import aiosqlite
+
+from background import start_loop
+from database import DB_PATH
+from scene import any_scene_running
+
+BACKUP_DIR = "data/backups"
+BACKUP_KEEP = 14                 # Newest backups kept; older ones are deleted
+BACKUP_INTERVAL = 6 * 60 * 60    # Seconds between backups
+BACKUP_PAGES = 64                # Pages copied per backup step
+BACKUP_STEP_SLEEP = 0.01         # Pause between steps so writers get a turn
+
+UPKEEP_INTERVAL = 60 * 60        # Seconds between checkpoint/optimize/vacuum
+VACUUM_PAGES = 256               # Most free pages reclaimed per upkeep run
+
+CHECK_INTERVAL = 60              # How often the loop looks for due work
+
+
+def _log_timing(name: str, started: float):
+    print(f"Maintenance: {name} took {(time.perf_counter() - started) * 1000:.1f} ms")
+
+# ── Backups ───────────────────────────────────────────────────────────────────
+
+async def backup_database() -> str:
+    """
+    Copy the live database to a new file in BACKUP_DIR with SQLite's online
+    backup API, a few pages at a time, then prune old backups.
+    Returns the path of the new backup.
+    """
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    path = os.path.join(BACKUP_DIR, f"typhon-{datetime.now():%Y%m%d-%H%M%S}.db")
+    partial = path + ".part"
+
+    started = time.perf_counter()
+    async with aiosqlite.connect(DB_PATH) as source, aiosqlite.connect(partial) as target:
+        await source.backup(target, pages=BACKUP_PAGES, sleep=BACKUP_STEP_SLEEP)
+    os.replace(partial, path)  # Only complete backups ever carry the real name
+    _log_timing(f"backup to {path}", started)
+
+    for old in sorted(glob.glob(os.path.join(BACKUP_DIR, "typhon-*.db")))[:-BACKUP_KEEP]:
+        os.remove(old)
+        print(f"Maintenance: removed old backup {old}")
+
+    return path
+
+# ── Upkeep ────────────────────────────────────────────────────────────────────
+
+async def run_upkeep(allow_full_vacuum: bool = True):
+    """
+    Checkpoint the WAL, refresh query planner stats and reclaim free pages.
+    A database that predates incremental auto-vacuum needs a one-off full
+    VACUUM first, which locks it for a while; that only happens when
+    `allow_full_vacuum` is set and is otherwise left for a later run.
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        started = time.perf_counter()
+        async with db.execute("PRAGMA wal_checkpoint(PASSIVE)") as cursor:
+            busy, log_pages, checkpointed = await cursor.fetchone()
+        _log_timing(f"WAL checkpoint ({checkpointed}/{log_pages} pages)", started)
+
+        started = time.perf_counter()
+        await db.execute("PRAGMA optimize")
+        _log_timing("optimize", started)
+
+        async with db.execute("PRAGMA auto_vacuum") as cursor:
+            (auto_vacuum,) = await cursor.fetchone()
+
+        started = time.perf_counter()
+        if auto_vacuum == 2:
+            async with db.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES})") as cursor:
+                await cursor.fetchall()
+            _log_timing("incremental vacuum", started)
+        elif not allow_full_vacuum:
+            print("Maintenance: one-off VACUUM postponed until no scene is running")
+        else:
+            # Database predates incremental auto-vacuum: convert it once
+            await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            await db.execute("VACUUM")
+            _log_timing("one-off VACUUM to enable incremental vacuum", started)
+
+# ── Scheduling ────────────────────────────────────────────────────────────────
+
+async def _maintenance_loop():
+    next_backup = next_upkeep = time.monotonic()
+    while True:
+        await asyncio.sleep(CHECK_INTERVAL)
+        now = time.monotonic()
+
+        # Backups copy a few pages at a time, so they're fine mid-combat
+        if now >= next_backup:
+            next_backup = now + BACKUP_INTERVAL
+            try:
+                await backup_database()
+            except Exception as e:
+                print(f"Maintenance: backup failed: {e}")
+
+        # Upkeep is cheap and runs on schedule; only the one-off full VACUUM
+        # waits until no combat scene is running anywhere
+        if now >= next_upkeep:
+            next_upkeep = now + UPKEEP_INTERVAL
+            try:
+                await run_upkeep(allow_full_vacuum=not any_scene_running())
+            except Exception as e:
+                print(f"Maintenance: upkeep failed: {e}")
+
+
+def start_maintenance_task():
+    """Start the loop that runs backups and upkeep when they're due."""
+    start_loop("maintenance", _maintenance_loop)
@@ -0,0 +1,27 @@
+# metrics.py — Bot metrics gathered from each subsystem
+#
+# Subsystems register a function returning a dict of numbers; /metrics
+# collects them all at the time of asking.
+
+_sources = {}  # name → callable returning a dict
+
+
+def register(name: str, source):
+    """Add (or replace) a named metrics source."""
+    _sources[name] = source
+
+
+def collect() -> dict:
+    """Current metrics from every source, as {name: {metric: value}}."""
+    return {name: source() for name, source in _sources.items()}
+
+
+def percentiles(samples, points=(50, 95, 99)) -> dict:
+    """Nearest-rank percentiles of a list of numbers (empty → zeros)."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {f"p{p}": 0 for p in points}
+    return {
+        f"p{p}": ordered[min(len(ordered) - 1, len(ordered) * p // 100)]
+        for p in points
+    }
@@ -0,0 +1,74 @@
+# name_index.py — In-memory character name index for autocomplete
+#
+# Autocomplete fires on every keystroke and Discord wants an answer within
+# three seconds, so names are never looked up in SQLite. Each server keeps a
+# sorted list of (key, name, user_id) where the key is the casefolded name
+# from each word onwards ("dwayne hicks", "hicks"), so typing the start of
+# any word finds the character with a binary search.
+from bisect import bisect_left, insort
+
+_guilds = {}  # guild_id → sorted list of (key, name, user_id)
+_users = {}   # user_id → (guild_id, name), to find entries again on delete
+
+
+def _keys(name: str) -> list:
+    words = name.casefold().split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def add(guild_id: str, discord_user_id: str, name: str):
+    """Index a character (replacing any previous entry for the user)."""
+    remove(discord_user_id)
+    entries = _guilds.setdefault(guild_id, [])
+    for key in _keys(name):
+        insort(entries, (key, name, discord_user_id))
+    _users[discord_user_id] = (guild_id, name)
+
+
+def remove(discord_user_id: str):
+    """Drop a character from the index, if it's there."""
+    if discord_user_id not in _users:
+        return
+    guild_id, name = _users.pop(discord_user_id)
+    entries = _guilds[guild_id]
+    for key in _keys(name):
+        i = bisect_left(entries, (key, name, discord_user_id))
+        if i < len(entries) and entries[i] == (key, name, discord_user_id):
+            del entries[i]
+
+
+def build(rows):
+    """Rebuild the whole index from (guild_id, user_id, name) rows."""
+    _guilds.clear()
+    _users.clear()
+    for guild_id, discord_user_id, name in rows:
+        _guilds.setdefault(guild_id, []).extend(
+            (key, name, discord_user_id) for key in _keys(name)
+        )
+        _users[discord_user_id] = (guild_id, name)
+    for entries in _guilds.values():
+        entries.sort()
+
+
+def search(guild_id: str, prefix: str, limit: int = 25) -> list:
+    """
+    Characters in a server with a word starting with `prefix`.
+    Returns up to `limit` (name, user_id) pairs, alphabetical by match.
+    """
+    entries = _guilds.get(guild_id)
+    if not entries:
+        return []
+
+    prefix = " ".join(prefix.casefold().split())
+    results = []
+    seen = set()
+    i = bisect_left(entries, (prefix,))
+    while i < len(entries) and len(results) < limit:
+        key, name, discord_user_id = entries[i]
+        if not key.startswith(prefix):
+            break
+        if discord_user_id not in seen:
+            seen.add(discord_user_id)
+            results.append((name, discord_user_id))
+        i += 1
+    return results
@@ -0,0 +1,207 @@
+# outbound.py — Rate-limit-aware queue for messages the bot sends on its own
+#
+# Interaction responses go straight back to Discord. Everything else (sheet
+# refreshes, GM broadcasts, announcements) goes through this queue, which
+# keeps each channel inside its rate-limit bucket and merges whatever piles
+# up while a channel is waiting.
+import asyncio
+import time
+from collections import deque
+
+import discord
+
+import metrics
+
+# Discord's per-channel message bucket: this many sends...
+CHANNEL_RATE = 5
+# ...per this many seconds
+CHANNEL_PERIOD = 5.0
+
+MESSAGE_LIMIT = 2000
+EMBED_LIMIT = 10
+
+# Recent queue delays kept for the metrics percentiles
+DELAY_SAMPLES = 500
+
+
+class ChannelBucket:
+    """Sliding window of recent sends to one channel."""
+
+    def __init__(self):
+        self.sent = deque()
+        self.blocked_until = 0.0  # Set from a 429's retry_after
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until another message may go out (0 if it can go now)."""
+        while self.sent and self.sent[0] <= now - CHANNEL_PERIOD:
+            self.sent.popleft()
+        wait = self.blocked_until - now
+        if len(self.sent) >= CHANNEL_RATE:
+            wait = max(wait, self.sent[0] + CHANNEL_PERIOD - now)
+        return max(wait, 0.0)
+
+    def record(self, now: float):
+        self.sent.append(now)
+
+
+class OutboundScheduler:
+    """
+    Per-channel outbound queue.
+    Each channel with queued work gets a worker task that waits for its
+    bucket, merges queued sends into as few messages as fit, and exits
+    when the queue is empty.
+    """
+
+    def __init__(self):
+        self.client = None
+        self.queues = {}   # channel_id → deque of jobs
+        self.buckets = {}  # channel_id → ChannelBucket
+        self.workers = {}  # channel_id → asyncio.Task
+        self.delays = deque(maxlen=DELAY_SAMPLES)
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def start(self, client: discord.Client):
+        """Attach the client used to look up channels."""
+        self.client = client
+
+    # ── Queueing ──
+
+    def send(self, channel_id: str, content: str = None, embed: discord.Embed = None):
+        """Queue a new message to a channel."""
+        self._enqueue(channel_id, {
+            "kind": "send",
+            "content": content,
+            "embeds": [embed] if embed else [],
+            "queued_at": time.monotonic(),
+        })
+
+    def edit(self, channel_id: str, message_id: str, content: str = None,
+             embed: discord.Embed = None):
+        """
+        Queue an edit to one of the bot's messages.
+        If an edit to the same message is already waiting, it's replaced —
+        only the latest version is worth sending.
+        """
+        for job in self.queues.get(channel_id, ()):
+            if job["kind"] == "edit" and job["message_id"] == message_id:
+                job["content"] = content
+                job["embeds"] = [embed] if embed else []
+                self.coalesced += 1
+                return
+
+        self._enqueue(channel_id, {
+            "kind": "edit",
+            "message_id": message_id,
+            "content": content,
+            "embeds": [embed] if embed else [],
+            "queued_at": time.monotonic(),
+        })
+
+    def _enqueue(self, channel_id: str, job: dict):
+        self.queues.setdefault(channel_id, deque()).append(job)
+        if channel_id not in self.workers:
+            self.workers[channel_id] = asyncio.get_running_loop().create_task(
+                self._drain(channel_id)
+            )
+
+    # ── Delivery ──
+
+    def _take(self, queue: deque) -> list:
+        """
+        Pop the next job plus any queued sends that can ride along with it
+        in the same message.
+        """
+        jobs = [queue.popleft()]
+        if jobs[0]["kind"] != "send":
+            return jobs
+
+        length = len(jobs[0]["content"] or "")
+        embeds = len(jobs[0]["embeds"])
+        while queue and queue[0]["kind"] == "send":
+            extra = len(queue[0]["content"] or "")
+            if length + 2 + extra > MESSAGE_LIMIT or embeds + len(queue[0]["embeds"]) > EMBED_LIMIT:
+                break
+            length += 2 + extra
+            embeds += len(queue[0]["embeds"])
+            jobs.append(queue.popleft())
+
+        self.coalesced += len(jobs) - 1
+        return jobs
+
+    async def _deliver(self, channel_id: str, jobs: list):
+        channel = self.client.get_channel(int(channel_id))
+        if channel is None:
+            channel = await self.client.fetch_channel(int(channel_id))
+
+        content = "\n\n".join(job["content"] for job in jobs if job["content"]) or None
+        embeds = [embed for job in jobs for embed in job["embeds"]]
+
+        if jobs[0]["kind"] == "edit":
+            # Only touch what the edit supplies, so a sheet refresh keeps its text
+            changes = {}
+            if content is not None:
+                changes["content"] = content
+            if embeds:
+                changes["embeds"] = embeds
+            message = channel.get_partial_message(int(jobs[0]["message_id"]))
+            await message.edit(**changes)
+        else:
+            await channel.send(content=content, embeds=embeds)
+
+    async def _drain(self, channel_id: str):
+        queue = self.queues[channel_id]
+        bucket = self.buckets.setdefault(channel_id, ChannelBucket())
+        try:
+            while queue:
+                wait = bucket.wait_time(time.monotonic())
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue
+
+                jobs = self._take(queue)
+                try:
+                    await self._deliver(channel_id, jobs)
+                except discord.HTTPException as e:
+                    if e.status == 429:
+                        # Bucket emptier than we thought; back off and retry
+                        retry_after = float(e.response.headers.get("Retry-After", CHANNEL_PERIOD))
+                        bucket.blocked_until = time.monotonic() + retry_after
+                        queue.extendleft(reversed(jobs))
+                        continue
+                    print(f"Outbound message to channel {channel_id} failed: {e}")
+                    self.dropped += len(jobs)
+                    continue
+                except Exception as e:
+                    # Connection errors and the like; drop these jobs but keep
+                    # the worker alive for the rest of the queue
+                    print(f"Outbound message to channel {channel_id} failed: {e!r}")
+                    self.dropped += len(jobs)
+                    continue
+
+                now = time.monotonic()
+                bucket.record(now)
+                self.sent += 1
+                self.delays.extend(now - job["queued_at"] for job in jobs)
+        finally:
+            del self.workers[channel_id]
+            if not queue:
+                del self.queues[channel_id]
+
+    # ── Metrics ──
+
+    def metrics(self) -> dict:
+        delays = metrics.percentiles(self.delays)
+        return {
+            "queue_depth": sum(len(queue) for queue in self.queues.values()),
+            "channels_waiting": len(self.workers),
+            "messages_sent": self.sent,
+            "updates_coalesced": self.coalesced,
+            "dropped": self.dropped,
+            **{f"delay_{p}_ms": round(value * 1000) for p, value in delays.items()},
+        }
+
+
+scheduler = OutboundScheduler()
+metrics.register("outbound", scheduler.metrics)
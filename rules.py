@@ -0,0 +1,187 @@
+# rules.py — Data-driven rule tables for In Search of Typhon
+import asyncio
+import glob
+import json
+import os
+
+import database
+from background import start_loop
+
+RULES_DIR = "rules"
+DEFAULT_RULE_SET = "classic"
+
+# How often rule files are checked for changes (seconds)
+RELOAD_INTERVAL = 5
+
+MAX_STRESS = 10
+
+# ── Compiled tables ───────────────────────────────────────────────────────────
+
+class RollTable:
+    """
+    A D6 + modifiers table (panic, stress responses).
+    Compiled into one flat list indexed by the roll total, so a lookup is
+    a clamp and an index — no parsing or range checks per roll.
+    """
+
+    __slots__ = ("title", "stress_factor", "resolve_factor", "low", "high", "effects")
+
+    def __init__(self, data: dict):
+        self.title = data["title"]
+        self.stress_factor = data.get("roll", {}).get("stress", 1)
+        self.resolve_factor = data.get("roll", {}).get("resolve", 0)
+
+        # Entries are keyed "7" or "7-9"; together they must cover low..high
+        ranges = []
+        for key, effect in data["entries"].items():
+            low, _, high = key.partition("-")
+            ranges.append((int(low), int(high or low), effect))
+        ranges.sort()
+
+        self.low = ranges[0][0]
+        self.high = ranges[-1][1]
+        self.effects = [None] * (self.high + 1)
+        expected = self.low
+        for low, high, effect in ranges:
+            if low != expected or high < low:
+                raise ValueError(
+                    f"{self.title} table entries must cover {self.low}-{self.high} "
+                    f"without gaps or overlaps (problem at {low})"
+                )
+            for total in range(low, high + 1):
+                self.effects[total] = effect
+            expected = high + 1
+
+
+class RuleSet:
+    """A complete, compiled set of rule tables for one play style."""
+
+    __slots__ = (
+        "key", "name", "stress_bane", "panic", "uses_resolve", "stress_labels", "health_labels"
+    )
+
+    def __init__(self, key: str, data: dict):
+        self.key = key
+        self.name = data["name"]
+
+        tables = {name: RollTable(table) for name, table in data["tables"].items()}
+        self.stress_bane = tables[data["stress_bane_table"]]  # 1s on stress dice
+        self.panic = tables[data["panic_table"]]               # /panic
+        self.uses_resolve = bool(self.stress_bane.resolve_factor or self.panic.resolve_factor)
+
+        # Stress labels: [[highest stress, label], ...] → one label per level
+        self.stress_labels = [None] * (MAX_STRESS + 1)
+        stress = 0
+        for upto, label in sorted(data["stress_labels"]):
+            while stress <= min(upto, MAX_STRESS):
+                self.stress_labels[stress] = label
+                stress += 1
+        if stress <= MAX_STRESS:
+            raise ValueError(f"Stress labels must reach {MAX_STRESS}")
+
+        # Health labels: [[lowest percent, label], ...] → one label per percent.
+        # 0% is Broken; any health above zero is at least 1%.
+        self.health_labels = [None] * 101
+        for percent in range(101):
+            for minimum, label in sorted(data["health_labels"], reverse=True):
+                if percent >= minimum:
+                    self.health_labels[percent] = label
+                    break
+            else:
+                raise ValueError(f"No health label covers {percent}%")
+
+    def stress_label(self, stress: int) -> str:
+        return self.stress_labels[min(max(stress, 0), MAX_STRESS)]
+
+    def health_label(self, health: int, max_health: int) -> str:
+        if health <= 0 or max_health <= 0:
+            return self.health_labels[0]
+        return self.health_labels[max(1, min(health * 100 // max_health, 100))]
+
+# ── Registry ──────────────────────────────────────────────────────────────────
+
+_rule_sets = {}     # key → RuleSet
+_mtimes = {}        # path → mtime when last loaded
+_guild_choice = {}  # guild_id → rule set key
+_guild_rules = {}   # guild_id → RuleSet, resolved ahead of time
+
+
+def _resolve_guilds():
+    """Point every guild at its (possibly just reloaded) RuleSet object."""
+    _guild_rules.clear()
+    for guild_id, key in _guild_choice.items():
+        if key in _rule_sets:
+            _guild_rules[guild_id] = _rule_sets[key]
+
+
+def load_rule_sets():
+    """
+    Load and compile every rule file that is new or has changed.
+    A file that fails to compile is reported and its old version kept.
+    """
+    paths = glob.glob(os.path.join(RULES_DIR, "*.json"))
+    changed = False
+
+    for path in paths:
+        mtime = os.path.getmtime(path)
+        if _mtimes.get(path) == mtime:
+            continue
+        _mtimes[path] = mtime
+
+        key = os.path.splitext(os.path.basename(path))[0]
+        try:
+            with open(path, encoding="utf-8") as f:
+                _rule_sets[key] = RuleSet(key, json.load(f))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Rule set '{key}' not loaded: {e}")
+            continue
+        print(f"Loaded rule set '{key}' ({_rule_sets[key].name})")
+        changed = True
+
+    if DEFAULT_RULE_SET not in _rule_sets:
+        raise RuntimeError(f"Default rule set '{DEFAULT_RULE_SET}' is missing from {RULES_DIR}/")
+    if changed:
+        _resolve_guilds()
+
+
+async def load_guild_rule_sets():
+    """Load each server's chosen rule set from the database."""
+    _guild_choice.update(await database.get_guild_rule_sets())
+    _resolve_guilds()
+
+
+def rule_set_names() -> dict:
+    """Loaded rule sets as {key: display name}."""
+    return {key: rules.name for key, rules in _rule_sets.items()}
+
+
+def rules_for(guild_id) -> RuleSet:
+    """The compiled rule set a server plays with."""
+    return _guild_rules.get(str(guild_id)) or _rule_sets[DEFAULT_RULE_SET]
+
+
+async def set_guild_rule_set(guild_id: str, key: str) -> RuleSet:
+    """
+    Choose a server's rule set.
+    Raises ValueError if no rule set with that key is loaded.
+    """
+    if key not in _rule_sets:
+        raise ValueError(f"Unknown rule set '{key}'.")
+    await database.set_guild_rule_set(guild_id, key)
+    _guild_choice[guild_id] = key
+    _guild_rules[guild_id] = _rule_sets[key]
+    return _rule_sets[key]
+
+
+async def _reload_loop():
+    while True:
+        await asyncio.sleep(RELOAD_INTERVAL)
+        try:
+            load_rule_sets()
+        except Exception as e:
+            print(f"Rule reload failed: {e}")
+
+
+def start_reload_task():
+    """Start checking rule files for changes every RELOAD_INTERVAL seconds."""
+    start_loop("rule-reload", _reload_loop)
@@ -0,0 +1,260 @@
+# scene.py — Write-behind combat scenes for In Search of Typhon
+import asyncio
+import json
+import random
+import time
+
+import database
+from background import start_loop
+
+# How often a running scene is snapshotted to the database (seconds)
+SNAPSHOT_INTERVAL = 30
+
+# Fields that live in memory while a scene is running
+SCENE_FIELDS = {"health", "stress", "last_roll", "last_roll_skill"}
+
+# ── Scene state ───────────────────────────────────────────────────────────────
+
+class Scene:
+    """
+    A server's combat scene.
+    Every character in the server is held in memory for the length of the
+    scene. Condition changes are applied in place and appended to an event
+    list; the database only sees periodic snapshots and the final write-back.
+    """
+
+    def __init__(self, guild_id: str, channel_id: str, characters: list):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.characters = {c["discord_user_id"]: c for c in characters}
+        self.rolls = {}         # user_id → last roll dict, kept decoded
+        self.initiative = []    # [user_id, card] pairs, lowest card first
+        self.events = []        # (timestamp, user_id, field, value), append-only
+        self.snapshot_count = 0  # len(events) at the last snapshot
+        self.started_at = time.time()
+
+    @property
+    def dirty(self) -> bool:
+        """True if anything changed since the last snapshot."""
+        return len(self.events) > self.snapshot_count
+
+    def apply(self, user_id: str, field: str, value):
+        """Change a character's condition in memory and log the event."""
+        self.characters[user_id][field] = value
+        self.events.append((time.time(), user_id, field, value))
+
+    def record_roll(self, user_id: str, roll_result: dict, skill_name: str):
+        """Keep the last roll in memory so it can be pushed."""
+        self.rolls[user_id] = roll_result
+        self.characters[user_id]["last_roll_skill"] = skill_name
+        self.events.append((time.time(), user_id, "last_roll", skill_name))
+
+    def last_roll(self, user_id: str):
+        """Return (roll_dict, skill_name) or (None, None)."""
+        char = self.characters[user_id]
+        if user_id in self.rolls:
+            return self.rolls[user_id], char["last_roll_skill"]
+        if not char["last_roll"]:
+            return None, None
+        return json.loads(char["last_roll"]), char["last_roll_skill"]
+
+    def deal_initiative(self) -> list:
+        """
+        Deal initiative cards (1-10, more if the crew is bigger) to everyone
+        in the scene. Returns the new order as [user_id, card] pairs.
+        """
+        user_ids = list(self.characters)
+        cards = random.sample(range(1, max(10, len(user_ids)) + 1), len(user_ids))
+        self.initiative = sorted(
+            ([user_id, card] for user_id, card in zip(user_ids, cards)),
+            key=lambda pair: pair[1]
+        )
+        self.events.append((time.time(), None, "initiative", self.initiative))
+        return self.initiative
+
+    def conditions(self) -> list:
+        """Current condition of every character, ready to write back."""
+        rows = []
+        for user_id, char in self.characters.items():
+            last_roll = char["last_roll"]
+            if user_id in self.rolls:
+                last_roll = json.dumps(self.rolls[user_id])
+            rows.append({
+                "discord_user_id": user_id,
+                "health": char["health"],
+                "stress": char["stress"],
+                "last_roll": last_roll,
+                "last_roll_skill": char["last_roll_skill"],
+            })
+        return rows
+
+    def state(self) -> dict:
+        """Everything needed to rebuild the scene after a crash."""
+        return {
+            "started_at": self.started_at,
+            "event_count": len(self.events),
+            "initiative": self.initiative,
+            "characters": self.conditions(),
+        }
+
+# ── Scene registry ────────────────────────────────────────────────────────────
+
+_scenes = {}   # guild_id → Scene
+_by_user = {}  # discord_user_id → Scene
+_locks = {}    # guild_id → asyncio.Lock; start, snapshot and end take turns
+
+
+def _lock(guild_id: str) -> asyncio.Lock:
+    return _locks.setdefault(guild_id, asyncio.Lock())
+
+
+def _register(scene: Scene):
+    _scenes[scene.guild_id] = scene
+    for user_id in scene.characters:
+        _by_user[user_id] = scene
+
+
+def _unregister(scene: Scene):
+    _scenes.pop(scene.guild_id, None)
+    for user_id in scene.characters:
+        if _by_user.get(user_id) is scene:
+            del _by_user[user_id]
+
+
+def active_scene(guild_id: str):
+    """Return the running scene for a server, or None."""
+    return _scenes.get(guild_id)
+
+
+def any_scene_running() -> bool:
+    """True if combat is under way anywhere (so heavy upkeep should wait)."""
+    return bool(_scenes)
+
+
+async def snapshot(scene: Scene):
+    """Write the scene's current state to the database."""
+    state = scene.state()
+    await database.save_scene_snapshot(scene.guild_id, scene.channel_id, state)
+    scene.snapshot_count = state["event_count"]
+
+
+async def start_scene(guild_id: str, channel_id: str) -> Scene:
+    """
+    Start a combat scene for a server.
+    Raises ValueError if one is already running.
+    """
+    async with _lock(guild_id):
+        if guild_id in _scenes:
+            raise ValueError("A scene is already running in this server.")
+
+        characters = await database.get_guild_characters(guild_id)
+        scene = Scene(guild_id, channel_id, characters)
+        _register(scene)
+        await snapshot(scene)  # So a crash straight away is still recoverable
+    return scene
+
+
+async def end_scene(guild_id: str):
+    """
+    End a server's combat scene and write every character back.
+    Returns the finished Scene, or None if no scene was running.
+    """
+    async with _lock(guild_id):
+        scene = _scenes.get(guild_id)
+        if scene is None:
+            return None
+
+        # Keep serving from memory until a write-back catches every event,
+        # so nothing that lands mid-write is lost.
+        while True:
+            event_count = len(scene.events)
+            await database.finish_scene(guild_id, scene.conditions())
+            if len(scene.events) == event_count:
+                break
+
+        _unregister(scene)
+    return scene
+
+
+async def restore_scenes():
+    """
+    Rebuild any scenes that were running when the bot last stopped,
+    from their latest snapshots.
+    """
+    for guild_id, channel_id, state in await database.get_scene_snapshots():
+        if guild_id in _scenes:
+            continue
+
+        characters = await database.get_guild_characters(guild_id)
+        saved = {c["discord_user_id"]: c for c in state["characters"]}
+        for char in characters:
+            char.update(saved.get(char["discord_user_id"], {}))
+
+        scene = Scene(guild_id, channel_id, characters)
+        scene.started_at = state["started_at"]
+        scene.initiative = state["initiative"]
+        _register(scene)
+        print(f"Restored combat scene in guild {guild_id} "
+              f"({len(characters)} character(s))")
+
+
+async def _snapshot_loop():
+    while True:
+        await asyncio.sleep(SNAPSHOT_INTERVAL)
+        for scene in list(_scenes.values()):
+            try:
+                async with _lock(scene.guild_id):
+                    # The scene may have ended while we waited for the lock;
+                    # a late snapshot would bring it back after a restart.
+                    if _scenes.get(scene.guild_id) is not scene or not scene.dirty:
+                        continue
+                    await snapshot(scene)
+            except Exception as e:
+                print(f"Scene snapshot failed for guild {scene.guild_id}: {e}")
+
+
+def start_snapshot_task():
+    """Start snapshotting running scenes every SNAPSHOT_INTERVAL seconds."""
+    start_loop("scene-snapshots", _snapshot_loop)
+
+# ── Character access ──────────────────────────────────────────────────────────
+# Drop-in replacements for the database functions of the same name. While a
+# character is in a scene these are served from memory; otherwise they go
+# straight to the database.
+
+async def get_character(discord_user_id: str):
+    """Fetch a character, with live scene condition if one is running."""
+    scene = _by_user.get(discord_user_id)
+    if scene is None:
+        return await database.get_character(discord_user_id)
+    return dict(scene.characters[discord_user_id])
+
+
+async def update_character_field(discord_user_id: str, field: str, value):
+    """Update a single field, in memory if the character is in a scene."""
+    scene = _by_user.get(discord_user_id)
+    if scene is None:
+        await database.update_character_field(discord_user_id, field, value)
+    elif field in SCENE_FIELDS:
+        scene.apply(discord_user_id, field, value)
+    else:
+        # Not scene state (e.g. training) — persist now, keep memory in step
+        await database.update_character_field(discord_user_id, field, value)
+        scene.characters[discord_user_id][field] = value
+
+
+async def save_last_roll(discord_user_id: str, roll_result: dict, skill_name: str):
+    """Save the last roll so the player can push it."""
+    scene = _by_user.get(discord_user_id)
+    if scene is None:
+        await database.save_last_roll(discord_user_id, roll_result, skill_name)
+    else:
+        scene.record_roll(discord_user_id, roll_result, skill_name)
+
+
+async def get_last_roll(discord_user_id: str):
+    """Retrieve the last roll for push mechanic."""
+    scene = _by_user.get(discord_user_id)
+    if scene is None:
+        return await database.get_last_roll(discord_user_id)
+    return scene.last_roll(discord_user_id)